@@ -16,8 +16,8 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import copy
 import torch
+import numpy as np
 import asyncio
 import bittensor as bt
 from traceback import print_exception
@@ -39,6 +39,7 @@ from prompting.validators.utils import (
     load_state,
     save_state,
     init_wandb,
+    set_hotkeys,
 )
 from prompting.validators.weights import should_set_weights, set_weights
 from prompting.validators.misc import ttl_get_block
@@ -87,6 +88,12 @@ class neuron:
 
     def init_reward_models(self):
         bt.logging.debug("loading", "reward_functions")
+        # Reward models run in bf16 where supported, it keeps the fp32 range without needing a scaler.
+        self.reward_dtype = (
+            torch.bfloat16
+            if self.device.type == "cuda" and torch.cuda.is_bf16_supported()
+            else torch.float16
+        )
         if self.config.neuron.mock_reward_models:
             self.reward_functions = []
             self.reward_weights = []
@@ -120,10 +127,19 @@ class neuron:
                 bt.logging.error(message)
                 raise Exception(message)
 
-            self.reward_functions = [
-                MistralRewardModel(device=self.device)
+            # Load transformer reward model weights directly in bf16, halving peak memory while loading.
+            weights_dtype = (
+                torch.bfloat16 if self.reward_dtype == torch.bfloat16 else None
+            )
+
+            mistral_model = (
+                MistralRewardModel(device=self.device, torch_dtype=weights_dtype)
                 if self.config.reward.mistral_weight > 0
-                else MockRewardModel(RewardModelType.mistral.value),
+                else MockRewardModel(RewardModelType.mistral.value)
+            )
+
+            self.reward_functions = [
+                mistral_model,
             ]
 
             if len(self.reward_functions) != len(self.reward_weights):
@@ -155,7 +171,7 @@ class neuron:
             )
 
             nsfw_model = (
-                NSFWRewardModel(device=self.device)
+                NSFWRewardModel(device=self.device, torch_dtype=weights_dtype)
                 if not self.config.neuron.nsfw_off
                 else MockRewardModel(RewardModelType.nsfw.value)
             )
@@ -214,7 +230,9 @@ class neuron:
             netuid=self.config.netuid, network=self.subtensor.network, sync=False
         )  # Make sure not to sync without passing subtensor
         self.metagraph.sync(subtensor=self.subtensor)  # Sync metagraph with subtensor.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
+        set_hotkeys(self, self.metagraph.hotkeys)
+        self._avail_uids_cache = None
+        self._axons_arr = np.array(self.metagraph.axons, dtype=object)
         bt.logging.debug(str(self.metagraph))
 
         # Init Weights.
@@ -275,9 +293,28 @@ class neuron:
 
         self.init_reward_models()
 
-        # Init the event loop.
+        # Init the event loop, using uvloop when it is installed.
+        try:
+            import uvloop
+
+            uvloop.install()
+        except ImportError:
+            bt.logging.debug(
+                "uvloop not installed, using the default asyncio event loop"
+            )
         self.loop = asyncio.get_event_loop()
 
+        # Give each concurrent forward its own cuda stream so the forwards can overlap on the gpu.
+        # The models within one forward share its stream and run one after the other.
+        self._forward_streams = [
+            (
+                torch.cuda.Stream(device=self.device)
+                if self.device.type == "cuda"
+                else None
+            )
+            for _ in range(self.config.neuron.num_concurrent_forwards)
+        ]
+
         # Init wandb.
         if not self.config.wandb.off:
             bt.logging.debug("loading", "wandb")
@@ -302,45 +339,41 @@ class neuron:
         load_state(self)
         checkpoint(self)
         try:
-            while True:
-                if not self.wallet.hotkey.ss58_address in self.metagraph.hotkeys:
-                    raise Exception(
-                        f"Validator is not registered - hotkey {self.wallet.hotkey.ss58_address} not in metagraph"
-                    )
-
-                bt.logging.info(f"step({self.step}) block({ttl_get_block( self )})")
-
-                # Run multiple forwards.
-                async def run_forward():
-                    coroutines = [
-                        forward(self)
-                        for _ in range(self.config.neuron.num_concurrent_forwards)
-                    ]
-                    await asyncio.gather(*coroutines)
-
-                self.loop.run_until_complete(run_forward())
-
-                
-                if self.should_update():
-                    # Resync the network state
-                    checkpoint(self)
-                    if should_set_weights(self):
-                        # Set the weights on chain.
-                        set_weights(self)
-                        save_state(self)
-                        
-                    self.prev_block = ttl_get_block(self)
-                    
-                    
-
-                # Rollover wandb to a new run.
-                if should_reinit_wandb(self):
-                    reinit_wandb(self)
-                self.step += 1
+            # Drive every step from a single long running coroutine on the persistent event loop.
+            self.loop.run_until_complete(self.run_async())
         except Exception as err:
             bt.logging.error("Error in training loop", str(err))
             bt.logging.debug(print_exception(type(err), err, err.__traceback__))
 
+    async def run_async(self):
+        while True:
+            if not self.wallet.hotkey.ss58_address in self.metagraph.hotkeys:
+                raise Exception(
+                    f"Validator is not registered - hotkey {self.wallet.hotkey.ss58_address} not in metagraph"
+                )
+
+            bt.logging.info(f"step({self.step}) block({ttl_get_block( self )})")
+
+            # Run multiple forwards.
+            await asyncio.gather(
+                *[forward(self, stream=stream) for stream in self._forward_streams]
+            )
+
+            if self.should_update():
+                # Resync the network state
+                checkpoint(self)
+                if should_set_weights(self):
+                    # Set the weights on chain.
+                    set_weights(self)
+                    save_state(self)
+
+                self.prev_block = ttl_get_block(self)
+
+            # Rollover wandb to a new run.
+            if should_reinit_wandb(self):
+                reinit_wandb(self)
+            self.step += 1
+
 
 def main():
     neuron().run()
@@ -19,6 +19,8 @@
 
 import time
 import torch
+import asyncio
+import inspect
 import random
 import bittensor as bt
 import random
@@ -29,7 +31,7 @@ from dataclasses import asdict
 from prompting.validators.event import EventSchema
 from prompting.validators.misc import ttl_get_block
 from prompting.validators.prompts import followup_prompt, answer_prompt, augment_prompt
-from prompting.validators.utils import check_uid_availability
+from prompting.validators.utils import get_available_uids
 from prompting.validators.tasks import (
     RoleplayTask,
 
@@ -54,27 +56,23 @@ def get_random_uids(self, k: int, exclude: List[int] = None) -> torch.LongTensor
     Notes:
         If `k` is larger than the number of available `uids`, set `k` to the number of available `uids`.
     """
-    candidate_uids = []
-    avail_uids = []
-
-    for uid in range(self.metagraph.n.item()):
-        uid_is_available = check_uid_availability(
-            self.metagraph, uid, self.config.neuron.vpermit_tao_limit
+    # Availability only changes when the metagraph is resynced, which clears the cache.
+    if self._avail_uids_cache is None:
+        self._avail_uids_cache = get_available_uids(
+            self.metagraph, self.config.neuron.vpermit_tao_limit
         )
-        uid_is_not_excluded = exclude is None or uid not in exclude
 
-        if uid_is_available and uid_is_not_excluded:
-            candidate_uids.append(uid)
+    avail = self._avail_uids_cache.clone()
+    if exclude:
+        # Ignore excluded uids that are not part of the metagraph.
+        exclude = torch.as_tensor(exclude, dtype=torch.long)
+        avail[exclude[(exclude >= 0) & (exclude < avail.numel())]] = False
+    candidate_uids = avail.nonzero(as_tuple=True)[0]
 
     # If not enough candidate_uids, use all available uids
-    if len(candidate_uids) < k:
-        k = len(candidate_uids)
+    k = min(k, candidate_uids.numel())
 
-    uids = (
-        torch.tensor(random.sample(candidate_uids, k))
-        if candidate_uids
-        else torch.LongTensor([])
-    )
+    uids = candidate_uids[torch.randperm(candidate_uids.numel())[:k]]
     return uids
 
 
@@ -91,52 +89,178 @@ def restrict_format_followup_responses(
             max_words = 40
             if "?" in completion:
                 # take first question that is found and only use the sentence before the question mark
-                completion = completion.split("?")[0].split(".")[-1]
-                response.completion = " ".join(completion.split(" ")[-max_words:]) + "?"
+                completion = completion.partition("?")[0].rpartition(".")[2]
+                response.completion = (
+                    " ".join(completion.rsplit(" ", max_words)[-max_words:]) + "?"
+                )
             else:
                 # otherwise take the last sentence
-                completion = completion.split(".")[-1].split(".")[-1]
-                response.completion = " ".join(completion.split(" ")[-max_words:])
+                completion = completion.rpartition(".")[2]
+                response.completion = " ".join(
+                    completion.rsplit(" ", max_words)[-max_words:]
+                )
+
+
+def to_device(tensor: torch.Tensor, device: torch.device) -> torch.Tensor:
+    """Moves tensor to device, skipping the dispatch when it already lives there."""
+    if tensor.device == device:
+        return tensor
+    return tensor.to(device, non_blocking=True)
+
+
+def update_moving_averaged_scores(
+    scores: torch.FloatTensor,
+    uids: torch.LongTensor,
+    rewards: torch.FloatTensor,
+    alpha: float,
+) -> torch.FloatTensor:
+    """Updates scores in place with a moving average of rewards for the queried uids.
+    The other uids keep their current moving average.
+    """
+    updated_scores = scores[uids].mul_(1 - alpha).add_(rewards, alpha=alpha)
+    return scores.scatter_(0, uids, updated_scores)
+
+
+def stream_context(stream: "torch.cuda.Stream" = None):
+    """Returns a context entering stream once it has caught up with the current stream.
+    Inputs are produced on the default stream with non blocking copies, so work queued on stream
+    must wait for them before reading.
+    """
+    if stream is not None:
+        stream.wait_stream(torch.cuda.current_stream(stream.device))
+    return torch.cuda.stream(stream)
 
 
-def compute_rewards(
-    self, task: RoleplayTask, responses: List[bt.Synapse], task_name: str, event: dict
+async def apply_model(self, fn, *args, stream: "torch.cuda.Stream" = None):
+    """Runs a reward, masking or penalty call without blocking the event loop.
+    Coroutine functions are awaited directly, synchronous ones are dispatched to the default executor
+    under inference mode and, on cuda, autocast to the reward model dtype on the given stream.
+    All models of a forward share its stream, so on the gpu they run one after the other; only
+    concurrent forwards overlap.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args)
+
+    # Grad mode, autocast and the current stream are thread local, so enter them inside the executor thread.
+    def run():
+        with stream_context(stream), torch.inference_mode(), torch.autocast(
+            device_type="cuda",
+            dtype=self.reward_dtype,
+            enabled=self.device.type == "cuda",
+        ):
+            result = fn(*args)
+        # Make the outputs safe to consume from other streams.
+        if stream is not None:
+            stream.synchronize()
+        return result
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, run)
+
+
+async def compute_rewards(
+    self,
+    task: RoleplayTask,
+    responses: List[bt.Synapse],
+    task_name: str,
+    event: dict,
+    stream: "torch.cuda.Stream" = None,
 ) -> torch.FloatTensor:
+    device = self.device
+
     # Compute the rewards for the responses given the prompt.
-    rewards: torch.FloatTensor = torch.zeros(len(responses), dtype=torch.float32).to(
-        self.device
+    rewards: torch.FloatTensor = torch.zeros(
+        len(responses), dtype=torch.float32, device=device
     )
 
-    # Computes the rewards for the responses given the prompt.
-    for weight_i, reward_fn_i in zip(self.reward_weights, self.reward_functions):
-        reward_i_normalized, reward_event = reward_fn_i.apply(
-            task.base_text, responses, task_name
+    # Every model scores the same responses independently, so dispatch them all at once.
+    reward_results, masking_results, penalty_results = await asyncio.gather(
+        asyncio.gather(
+            *[
+                apply_model(
+                    self,
+                    reward_fn_i.apply,
+                    task.base_text,
+                    responses,
+                    task_name,
+                    stream=stream,
+                )
+                for reward_fn_i in self.reward_functions
+            ]
+        ),
+        asyncio.gather(
+            *[
+                apply_model(
+                    self,
+                    masking_fn_i.apply,
+                    task.base_text,
+                    responses,
+                    task_name,
+                    stream=stream,
+                )
+                for masking_fn_i in self.masking_functions
+            ]
+        ),
+        asyncio.gather(
+            *[
+                apply_model(
+                    self, penalty_fn_i.apply_penalties, responses, task, stream=stream
+                )
+                for penalty_fn_i in self.penalty_functions
+            ]
+        ),
+    )
+
+    # Computes the rewards for the responses given the prompt as a weighted sum over reward models.
+    # shape: [ len(reward_functions), len(responses) ]
+    if reward_results:
+        reward_matrix: torch.FloatTensor = torch.stack(
+            [
+                to_device(reward_i_normalized.float(), device)
+                for reward_i_normalized, _ in reward_results
+            ],
+            dim=0,
         )
-        rewards += weight_i * reward_i_normalized.to(self.device)
+        rewards = torch.mv(reward_matrix.T, self.reward_weights)
+
+    # Masks including diversity.
+    if masking_results:
+        rewards *= torch.stack(
+            [
+                to_device(mask_i_normalized.float(), device)
+                for mask_i_normalized, _ in masking_results
+            ],
+            dim=0,
+        ).prod(dim=0)
+
+    if penalty_results:
+        rewards *= torch.stack(
+            [
+                to_device(applied_penalty_i.float(), device)
+                for _, _, applied_penalty_i in penalty_results
+            ],
+            dim=0,
+        ).prod(dim=0)
+
+    for reward_fn_i, (reward_i_normalized, reward_event) in zip(
+        self.reward_functions, reward_results
+    ):
         if not self.config.neuron.disable_log_rewards:
             event.update(reward_event)
         bt.logging.trace(str(reward_fn_i.name), reward_i_normalized.tolist())
-    
-
-    for masking_fn_i in self.masking_functions:
-        mask_i_normalized, reward_event = masking_fn_i.apply(
-            task.base_text, responses, task_name
-        )
-        rewards *= mask_i_normalized.to(self.device)  # includes diversity
 
+    for masking_fn_i, (mask_i_normalized, reward_event) in zip(
+        self.masking_functions, masking_results
+    ):
         if not self.config.neuron.disable_log_rewards:
             event.update(reward_event)
         bt.logging.trace(str(masking_fn_i.name), mask_i_normalized.tolist())
-        
-
-    for penalty_fn_i in self.penalty_functions:
-        (
-            raw_penalty_i,
-            adjusted_penalty_i,
-            applied_penalty_i,
-        ) = penalty_fn_i.apply_penalties(responses, task)
-        rewards *= applied_penalty_i.to(self.device)
 
+    for penalty_fn_i, (
+        raw_penalty_i,
+        adjusted_penalty_i,
+        applied_penalty_i,
+    ) in zip(self.penalty_functions, penalty_results):
         if not self.config.neuron.disable_log_rewards:
             event[penalty_fn_i.name + "_raw"] = raw_penalty_i.tolist()
             event[penalty_fn_i.name + "_adjusted"] = adjusted_penalty_i.tolist()
@@ -147,7 +271,12 @@ def compute_rewards(
 
 
 async def run_step(
-    self, task: RoleplayTask, k: int, timeout: float, exclude: list = []
+    self,
+    task: RoleplayTask,
+    k: int,
+    timeout: float,
+    exclude: list = [],
+    stream: "torch.cuda.Stream" = None,
 ):
     task_name = task.task_name
 
@@ -167,8 +296,9 @@ async def run_step(
     event = {"name": task_name, "task_type": task.task_type}
     start_time = time.time()
     # Get the list of uids to query for this step.
-    uids = get_random_uids(self, k=k, exclude=exclude).to(self.device)
-    axons = [self.metagraph.axons[uid] for uid in uids]
+    uids = get_random_uids(self, k=k, exclude=exclude)
+    axons = self._axons_arr[uids.numpy()].tolist()
+    uids = uids.to(self.device)
 
     synapse = prompting.protocol.Prompting(
         character_name=character["name"],
@@ -179,58 +309,83 @@ async def run_step(
         criteria=task.get_criteria_strs(),
     )
 
-    # Make calls to the network with the prompt.
-    responses: List[bt.Synapse] = await self.dendrite(
-        axons=axons,
-        synapse=synapse,
-        timeout=timeout,
-    )
+    # The frozen gating encoder only needs the prompt, so run it while waiting on the network.
+    # The trainable linear layer is applied right before the backward, so concurrent forwards
+    # never train on scores computed with weights another forward has since updated.
+    def gating_encode():
+        with stream_context(stream):
+            encoding = self.gating_model.encode(prompt)
+        if stream is not None:
+            stream.synchronize()
+        return encoding
+
+    gating_future = asyncio.get_running_loop().run_in_executor(None, gating_encode)
+
+    try:
+        # Make calls to the network with the prompt.
+        responses: List[bt.Synapse] = await self.dendrite(
+            axons=axons,
+            synapse=synapse,
+            timeout=timeout,
+        )
 
-    # Update blacklist with completions so that n-gram filtering can be applied
-    self.blacklist.add(
-        [response.completion for response in responses if response.completion]
-    )
+        # Update blacklist with completions so that n-gram filtering can be applied.
+        # Runs in the executor so tokenization and waiting on the blacklist lock never block the event loop.
+        await asyncio.get_running_loop().run_in_executor(
+            None,
+            self.blacklist.add,
+            [response.completion for response in responses if response.completion],
+        )
 
-    restrict_format_followup_responses(self, responses, task_name)
+        restrict_format_followup_responses(self, responses, task_name)
+
+        rewards: torch.FloatTensor = await compute_rewards(
+            self, task, responses, task_name, event, stream=stream
+        )
+    finally:
+        # Always collect the gating encoder so its thread never outlives the step and its
+        # exception is retrieved, without masking an error raised above.
+        await asyncio.gather(gating_future, return_exceptions=True)
 
-    rewards : torch.FloatTensor  = compute_rewards(self, task, responses, task_name, event)
-    
     # Train the gating model based on the predicted scores and the actual rewards.
-    gating_scores: torch.FloatTensor = self.gating_model(prompt).to(self.device)
-    gating_loss: torch.FloatTensor = self.gating_model.backward(
-        scores=gating_scores[uids], rewards=rewards
-    )
+    gating_encoding: torch.FloatTensor = await gating_future
+    with stream_context(stream):
+        gating_scores: torch.FloatTensor = self.gating_model.score(gating_encoding).to(
+            self.device
+        )
+        gating_loss: torch.FloatTensor = self.gating_model.backward(
+            scores=gating_scores[uids], rewards=rewards
+        )
+    # The moving average update below runs on the default stream, so order it after the backward
+    # on the device instead of blocking the event loop until the stream drains.
+    if stream is not None:
+        torch.cuda.current_stream(stream.device).wait_stream(stream)
+
+    # Collect completions, status messages, status codes and completion times in a single pass.
+    completions: List[str] = []
+    completion_status_message: List[str] = []
+    completion_status_codes: List[str] = []
+    completion_times: List[float] = []
+    for comp in responses:
+        completions.append(comp.completion)
+        completion_status_message.append(str(comp.dendrite.status_message))
+        completion_status_codes.append(str(comp.dendrite.status_code))
+        completion_times.append(
+            comp.dendrite.process_time if comp.dendrite.process_time != None else 0
+        )
 
     # Find the best completion given the rewards vector.
-    completions: List[str] = [comp.completion for comp in responses]
-    completion_status_message: List[str] = [
-        str(comp.dendrite.status_message) for comp in responses
-    ]
-    completion_status_codes: List[str] = [
-        str(comp.dendrite.status_code) for comp in responses
-    ]
-
     best: str = completions[rewards.argmax(dim=0)].strip()
 
-    # Get completion times
-    completion_times: List[float] = [
-        comp.dendrite.process_time if comp.dendrite.process_time != None else 0
-        for comp in responses
-    ]
-
-    # Compute forward pass rewards, assumes followup_uids and answer_uids are mutually exclusive.
+    # Update moving_averaged_scores in place with rewards produced by this step.
     # shape: [ metagraph.n ]
-    scattered_rewards: torch.FloatTensor = self.moving_averaged_scores.scatter(
-        0, uids, rewards
-    ).to(self.device)
+    update_moving_averaged_scores(
+        self.moving_averaged_scores,
+        uids,
+        rewards,
+        self.config.neuron.moving_average_alpha,
+    )
 
-    # Update moving_averaged_scores with rewards produced by this step.
-    # shape: [ metagraph.n ]
-    alpha: float = self.config.neuron.moving_average_alpha
-    self.moving_averaged_scores: torch.FloatTensor = alpha * scattered_rewards + (
-        1 - alpha
-    ) * self.moving_averaged_scores.to(self.device)
-    
     # Log the step event.
     event.update(
         {
@@ -263,7 +418,7 @@ async def run_step(
     return event
 
 
-async def run_character_flow(self):
+async def run_character_flow(self, stream: "torch.cuda.Stream" = None):
     # Choose some random character
     character: Character = next(self.character_set)
 
@@ -283,11 +438,12 @@ async def run_character_flow(self):
         task=message_from_description_task,
         k=self.config.neuron.followup_sample_size,
         timeout=self.config.neuron.followup_timeout,
+        stream=stream,
     )
 
 
 
-async def forward(self):
+async def forward(self, stream: "torch.cuda.Stream" = None):
     # Definition of flow to be executed at forward step
     # await questions_and_answers_around_summary_flow(self)
-    await run_character_flow(self)
+    await run_character_flow(self, stream=stream)
@@ -72,6 +72,14 @@ class BaseGatingModel(torch.nn.Module, ABC):
     def forward(self, message: str) -> "torch.FloatTensor":
         """Forward pass through the gating model"""
 
+    @abstractmethod
+    def encode(self, message: str) -> "torch.FloatTensor":
+        """Encodes the message with the frozen encoding layer of the gating model"""
+
+    def score(self, encoding: "torch.FloatTensor") -> "torch.FloatTensor":
+        """Scores each uid from an encoded message with the trainable linear layer"""
+        return self.linear(encoding)
+
     @abstractmethod
     def backward(self, scores: "torch.FloatTensor", rewards: "torch.FloatTensor"):
         """Backward pass through the gating model"""
@@ -181,6 +189,17 @@ class GatingModel(BaseGatingModel):
             scores (:obj:`torch.FloatTensor` of shape :obj:`(network_size)`):
                 Scores for each uids as output by the gating model.
         """
+        return self.score(self.encode(message))
+
+    def encode(self, message: str) -> "torch.FloatTensor":
+        """Encodes the message with the frozen transformer.
+        Args:
+            message (:obj:`str`):
+                text message to be encoded.
+        Returns:
+            hidden_states (:obj:`torch.FloatTensor` of shape :obj:`(hidden_size)`):
+                Last hidden state of the final token.
+        """
         encoded_input = self.tokenizer(
             message,
             truncation=True,
@@ -194,7 +213,7 @@ class GatingModel(BaseGatingModel):
 
         with torch.no_grad():
             hidden_states = self.model(**encoded_input).last_hidden_state[0, -1, :]
-        return self.linear(hidden_states)
+        return hidden_states
 
     def resync(
         self,
@@ -281,6 +300,17 @@ class SentenceEmbedGatingModel(BaseGatingModel):
             scores (:obj:`torch.FloatTensor` of shape :obj:`(network_size)`):
                 Scores for each uids as output by the gating model.
         """
+        return self.score(self.encode(message))
+
+    def encode(self, message: str) -> "torch.FloatTensor":
+        """Encodes the message with the frozen sentence transformer.
+        Args:
+            message (:obj:`str`):
+                text message to be encoded.
+        Returns:
+            batch_representation (:obj:`torch.FloatTensor` of shape :obj:`(hidden_size)`):
+                Mean of the normalized sentence embeddings.
+        """
         encoded_input = self.tokenizer(
             message,
             padding=True,
@@ -303,9 +333,7 @@ class SentenceEmbedGatingModel(BaseGatingModel):
         )
         batch_representation = torch.mean(sentence_embeddings, dim=0)
 
-        scores = self.linear(batch_representation)
-
-        return scores
+        return batch_representation
 
     def backward(self, scores: torch.FloatTensor, rewards: torch.FloatTensor):
         """Runs a backward pass through the model.
@@ -35,6 +35,12 @@ class MockGatingModel(BaseGatingModel):
     def forward(self, message: str) -> "torch.FloatTensor":
         return torch.randn(self.num_uids)
 
+    def encode(self, message: str) -> "torch.FloatTensor":
+        return torch.randn(256)
+
+    def score(self, encoding: torch.FloatTensor) -> "torch.FloatTensor":
+        return torch.randn(self.num_uids)
+
     def backward(self, scores: torch.FloatTensor, rewards: torch.FloatTensor):
         return torch.tensor(0.0)
 
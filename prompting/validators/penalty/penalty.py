@@ -45,8 +45,21 @@ class BasePenaltyModel(ABC):
     def apply_penalties(
         self, responses: List[bt.Synapse], task: Task
     ) -> torch.FloatTensor:
-        completions = [response.completion for response in responses]
-        raw_penalties = self.calculate_penalties(task, completions)
+        # Only score correctly responding calls with a non empty completion, the rest get no penalty.
+        successful_completions_indices: List[int] = [
+            idx
+            for idx, response in enumerate(responses)
+            if response.dendrite.status_code == 200 and response.completion.strip()
+        ]
+        successful_completions: List[str] = [
+            responses[idx].completion for idx in successful_completions_indices
+        ]
+
+        raw_penalties = torch.zeros(len(responses), dtype=torch.float32)
+        if successful_completions:
+            raw_penalties[successful_completions_indices] = self.calculate_penalties(
+                task, successful_completions
+            )
 
         # Clip penalties between 0 and 1
         adjusted_penalties = torch.clip(raw_penalties, 0, 1)
@@ -19,11 +19,12 @@
 import re
 import torch
 import math
+import threading
 from fuzzywuzzy import fuzz
 from typing import List, Union
 from .config import RewardModelType
 from .reward import BaseRewardModel, BaseRewardEvent
-from transformers import BertTokenizer
+from transformers import BertTokenizerFast
 from dataclasses import dataclass
 
 
@@ -100,10 +101,13 @@ class Blacklist(BaseRewardModel):
         self.num_completion = 0
 
         self.half_life = half_life
-        self.tokenizer = BertTokenizer.from_pretrained("bert-base-cased")
+        self.tokenizer = BertTokenizerFast.from_pretrained("bert-base-cased")
         self.memory_lim = memory_lim
         self.frequency_multiplier = frequency_multiplier
 
+        # Rewards are computed in executor threads while other forwards keep adding completions.
+        self.lock = threading.RLock()
+
     def add(self, texts: List[str]):
         """Extract and add n-grams from a list of texts to counter
 
@@ -111,29 +115,46 @@ class Blacklist(BaseRewardModel):
             texts (list): batch of completion texts
         """
 
-        for text in texts:
-            # Extract n-grams from lowercased text
-            ngrams = self.extract_ngrams(text.lower())
+        # Tokenize the whole batch of texts in a single call.
+        tokenized_texts = self.tokenize(texts)
 
-            if ngrams:
-                self._add_ngrams(ngrams)
+        with self.lock:
+            for words in tokenized_texts:
+                ngrams = self.ngrams_from_tokens(words)
 
-    def extract_ngrams(self, text: str) -> List[tuple]:
-        """Extract n-grams from text string
+                if ngrams:
+                    self._add_ngrams(ngrams)
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Tokenize a batch of texts into token ids, without special tokens
 
         Args:
-            text (str): completion text
+            texts (list): batch of completion texts
 
         Returns:
-            list: List of n-gram tuples
-
+            list: List of token id lists, one per text
         """
 
+        if not texts:
+            return []
+
         if self.preprocess:
             # remove all punctuation
-            text = self.preprocess.sub("", text)
+            texts = [self.preprocess.sub("", text) for text in texts]
+
+        input_ids = self.tokenizer([text.lower() for text in texts])["input_ids"]
+
+        return [words[1:-1] for words in input_ids]
+
+    def ngrams_from_tokens(self, words: List[int]) -> List[tuple]:
+        """Extract n-grams from a list of token ids
 
-        words = self.tokenizer(text.lower())["input_ids"][1:-1]
+        Args:
+            words (list): token ids of a completion
+
+        Returns:
+            list: List of n-gram tuples
+        """
 
         if self.word_limit is not None:
             words = words[: self.word_limit]
@@ -144,6 +165,19 @@ class Blacklist(BaseRewardModel):
 
         return ngrams
 
+    def extract_ngrams(self, text: str) -> List[tuple]:
+        """Extract n-grams from text string
+
+        Args:
+            text (str): completion text
+
+        Returns:
+            list: List of n-gram tuples
+
+        """
+
+        return self.ngrams_from_tokens(self.tokenize([text])[0])
+
     def _add_ngrams(self, ngrams: List[tuple]):
         """Adds n-grams to counter, removing old n-grams periodically.
         Counting and pruning method based on Lossy counter.
@@ -153,15 +187,17 @@ class Blacklist(BaseRewardModel):
             ngrams (List[tuple]): List of n-gram tuples
         """
 
+        counter = self.counter
+        max_error = self.w_current - 1
         for ngram in ngrams:
-            if ngram in self.counter:
-                self.counter[ngram][0] += 1
+            count = counter.get(ngram)
+            if count is not None:
+                count[0] += 1
             else:
                 # Store the tuple (frequency, max_error)
-                self.counter[ngram] = [1, self.w_current - 1]
-
-            self.num_ngram += 1
+                counter[ngram] = [1, max_error]
 
+        self.num_ngram += len(ngrams)
         self.num_completion += 1
 
         # Prune when move to next window.
@@ -231,10 +267,13 @@ class Blacklist(BaseRewardModel):
             dict: Dictionary of n-gram tuples and their significance scores
         """
 
-        if self.num_completion - self._last_update > self.window:
-            self.significance_scores = self.calculate_significance()
+        # Only the lookup holds the lock. The returned dict is replaced rather than mutated on updates,
+        # so callers can run the fuzzy matching over it without blocking add.
+        with self.lock:
+            if self.num_completion - self._last_update > self.window:
+                self.significance_scores = self.calculate_significance()
 
-        return self.significance_scores
+            return self.significance_scores
 
     def most_common(self, n: int = 10) -> dict:
         """Get most common n-grams in queue
@@ -13,9 +13,15 @@ class MistralRewardModel(BaseRewardModel):
     def name(self) -> str:
         return RewardModelType.mistral.value
 
-    def __init__(self, device: str):
+    def __init__(self, device: str, torch_dtype: torch.dtype = None):
         super().__init__()
         self.device = device
+        if torch_dtype is None:
+            torch_dtype = (
+                torch.float16
+                if torch.device(self.device).type == "cuda"
+                else torch.float32
+            )
         self.tokenizer = AutoTokenizer.from_pretrained(
             MistralRewardModel.reward_model_path,
             revision=MistralRewardModel.revision,
@@ -24,7 +30,7 @@ class MistralRewardModel(BaseRewardModel):
         self.model = AutoModelForSequenceClassification.from_pretrained(
             MistralRewardModel.reward_model_path,
             revision=MistralRewardModel.revision,
-            torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
+            torch_dtype=torch_dtype,
         ).to(self.device)
         self.reward_fn = pipeline(
             "text-classification",
@@ -36,33 +42,42 @@ class MistralRewardModel(BaseRewardModel):
             device=self.device,
         )
 
-    def reward(self, prompt: str, completion: str, name: str) -> BaseRewardEvent:
-        reward_event = BaseRewardEvent()
-        with torch.no_grad():
-            chat = [
-                {
-                    "role": "user",
-                    "content": prompt,
-                },
-                {
-                    "role": "assistant",
-                    "content": completion,
-                },
-            ]
+    def format_chat(self, prompt: str, completion: str) -> str:
+        chat = [
+            {
+                "role": "user",
+                "content": prompt,
+            },
+            {
+                "role": "assistant",
+                "content": completion,
+            },
+        ]
+        return self.tokenizer.apply_chat_template(chat, tokenize=False)
 
-            output = self.reward_fn(
-                self.tokenizer.apply_chat_template(chat, tokenize=False)
-            )
-            scores = [x["score"] for x in output]
-            reward_event.reward = float(scores[0])
-            return reward_event
+    def reward(self, prompt: str, completion: str, name: str) -> BaseRewardEvent:
+        return self.get_rewards(prompt, [completion], name)[0]
 
     def get_rewards(
         self, prompt: str, completions: List[str], name: str
     ) -> List[BaseRewardEvent]:
-        # Get all the reward results.
-        reward_events = [
-            self.reward(prompt, completion, name) for completion in completions
-        ]
+        if not completions:
+            return []
+
+        # Score all completions in a single pipeline call, one sequence per forward.
+        # Padded batches are avoided on purpose: the tokenizer and model config define no pad token, and
+        # the classification head picks the last non pad token, so padding could change the scores.
+        # With batch_size=1 every score matches the previous per-completion calls exactly.
+        with torch.no_grad():
+            outputs = self.reward_fn(
+                [self.format_chat(prompt, completion) for completion in completions],
+                batch_size=1,
+            )
+
+        reward_events = []
+        for output in outputs:
+            reward_event = BaseRewardEvent()
+            reward_event.reward = float(output["score"])
+            reward_events.append(reward_event)
 
         return reward_events
@@ -31,58 +31,73 @@ class NSFWRewardEvent(BaseRewardEvent):
 
 class NSFWRewardModel(BaseRewardModel):
     nsfw_filter_model_path = "facebook/roberta-hate-speech-dynabench-r4-target"
+    boundary: float = -0.5
+    chunk_size: int = 512
+    batch_size: int = 16
 
     @property
     def name(self) -> str:
         return RewardModelType.nsfw.value
 
-    def __init__(self, device: str):
+    def __init__(self, device: str, torch_dtype: torch.dtype = None):
         super().__init__()
         self.device = device
         self.tokenizer = AutoTokenizer.from_pretrained(
             NSFWRewardModel.nsfw_filter_model_path
         )
         self.model = AutoModelForSequenceClassification.from_pretrained(
-            NSFWRewardModel.nsfw_filter_model_path
+            NSFWRewardModel.nsfw_filter_model_path, torch_dtype=torch_dtype
         ).to(self.device)
 
     def reward(self, prompt: str, completion: str, name: str) -> NSFWRewardEvent:
-        reward_event = NSFWRewardEvent()
-
-        boundary = -0.5
-        with torch.no_grad():
-            message = completion
-            input_ids = self.tokenizer(message)["input_ids"]
-
-            # Returns the nsfw hate score for the chunk.
-            def hate_score(chunk) -> float:
-                nothate, hate = (
-                    self.model(torch.tensor([chunk]).to(self.device)).logits[0].tolist()
-                )
-                return nothate, hate
-
-            # Returns the max hate score from each chunk of size chunk_size
-            def sum_nsfw_scores(input_ids, chunk_size):
-                max_score = -1000
-                for i in range(0, len(input_ids), chunk_size):
-                    chunk_i = input_ids[i : i + chunk_size]
-                    not_hate_score_i, hate_score_i = hate_score(chunk_i)
-                    max_score = max(max(-not_hate_score_i, hate_score_i), max_score)
-                return max_score
-
-            # 0 when needs to be filtered out, 1 when it is safe
-            score = sum_nsfw_scores(input_ids, chunk_size=512)
-            reward_event.score = score
-            reward_event.reward = 0.0 if score > boundary else 1.0
-            return reward_event
+        return self.get_rewards(prompt, [completion], name)[0]
 
     def get_rewards(
         self, prompt: str, completions: List[str], name: str
     ) -> List[NSFWRewardEvent]:
-        # Get all the reward results.
-        reward_events = [
-            self.reward(prompt, completion, name) for completion in completions
-        ]
+        if not completions:
+            return []
+
+        # Tokenize every completion in a single call.
+        input_ids = self.tokenizer(completions)["input_ids"]
+
+        # Split each completion into chunks of size chunk_size, remembering which completion owns each chunk.
+        chunks, owners = [], []
+        for idx, completion_ids in enumerate(input_ids):
+            for i in range(0, len(completion_ids), NSFWRewardModel.chunk_size):
+                chunks.append(completion_ids[i : i + NSFWRewardModel.chunk_size])
+                owners.append(idx)
+
+        # Returns the max hate score over the chunks of each completion.
+        # Chunks are scored in padded sub-batches of batch_size so memory stays bounded however long completions are.
+        max_scores = [-1000] * len(completions)
+        for start in range(0, len(chunks), NSFWRewardModel.batch_size):
+            batch_chunks = chunks[start : start + NSFWRewardModel.batch_size]
+            batch_owners = owners[start : start + NSFWRewardModel.batch_size]
+
+            batch = self.tokenizer.pad({"input_ids": batch_chunks}, return_tensors="pt")
+            if torch.device(self.device).type == "cuda":
+                # Stage the batch in pinned memory so the copy to the gpu is asynchronous.
+                batch = {
+                    key: value.pin_memory().to(self.device, non_blocking=True)
+                    for key, value in batch.items()
+                }
+            else:
+                batch = batch.to(self.device)
+            with torch.no_grad():
+                logits = self.model(**batch).logits.tolist()
+            for idx, (not_hate_score_i, hate_score_i) in zip(batch_owners, logits):
+                max_scores[idx] = max(
+                    max(-not_hate_score_i, hate_score_i), max_scores[idx]
+                )
+
+        # 0 when needs to be filtered out, 1 when it is safe
+        reward_events = []
+        for score in max_scores:
+            reward_event = NSFWRewardEvent()
+            reward_event.score = score
+            reward_event.reward = 0.0 if score > NSFWRewardModel.boundary else 1.0
+            reward_events.append(reward_event)
 
         return reward_events
 
@@ -17,6 +17,7 @@
 # DEALINGS IN THE SOFTWARE.
 
 import torch
+import threading
 import bittensor as bt
 from typing import List, Union
 from abc import abstractmethod
@@ -66,6 +67,8 @@ class BaseRewardModel:
         self.mean = 0.0
         self.var = 0.0
         self.count_limit = 3000
+        # Concurrent forwards apply the same model from several executor threads.
+        self.normalization_lock = threading.Lock()
 
     def normalize_rewards(self, rewards: torch.FloatTensor) -> torch.FloatTensor:
         """
@@ -125,13 +128,13 @@ class BaseRewardModel:
     def apply(
         self, prompt: str, responses: List[bt.Synapse], name: str
     ) -> Union[torch.FloatTensor, dict]:
-        """Applies the reward model across each call. Unsuccessful responses are zeroed."""
-        # Get indices of correctly responding calls.
+        """Applies the reward model across each call. Unsuccessful and empty responses are zeroed without being scored."""
+        # Get indices of correctly responding calls with a non empty completion.
 
         successful_completions_indices: List[int] = [
             idx
             for idx, resp in enumerate(responses)
-            if resp.dendrite.status_code == 200
+            if resp.dendrite.status_code == 200 and resp.completion.strip()
         ]
 
         # Get all completions from responding calls.
@@ -147,8 +150,9 @@ class BaseRewardModel:
             reward_events.pop("reward"), dtype=torch.float32
         )
 
-        # Softmax rewards across samples.
-        successful_rewards_normalized = self.normalize_rewards(successful_rewards)
+        # Softmax rewards across samples, serializing the update of the running statistics.
+        with self.normalization_lock:
+            successful_rewards_normalized = self.normalize_rewards(successful_rewards)
 
         # Init zero rewards for all calls.
         filled_rewards = torch.ones(len(responses), dtype=torch.float32) * torch.nan
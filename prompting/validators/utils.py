@@ -19,9 +19,12 @@
 # Utils for checkpointing and saving the model.
 import torch
 import wandb
+import numpy as np
 import copy
+import hashlib
 import bittensor as bt
 import prompting.validators as validators
+from typing import List
 from prompting.validators.misc import ttl_get_block
 
 
@@ -101,6 +104,10 @@ def resync_metagraph(self: "validators.neuron.neuron"):
     # Sync the metagraph.
     self.metagraph.sync(subtensor=self.subtensor)
 
+    # Refresh the uid availability cache and axon lookup used when sampling uids.
+    self._avail_uids_cache = None
+    self._axons_arr = np.array(self.metagraph.axons, dtype=object)
+
     # Check if the metagraph axon info has changed.
     metagraph_axon_info_updated = previous_metagraph.axons != self.metagraph.axons
 
@@ -109,10 +116,11 @@ def resync_metagraph(self: "validators.neuron.neuron"):
             "Metagraph updated, re-syncing hotkeys, dendrite pool and moving averages"
         )
 
-        # Zero out all hotkeys that have been replaced.
-        for uid, hotkey in enumerate(self.hotkeys):
-            if hotkey != self.metagraph.hotkeys[uid]:
-                self.moving_averaged_scores[uid] = 0  # hotkey has been replaced
+        # Zero out all hotkeys that have been replaced, the hash tells whether any of them changed.
+        if hash_hotkeys(self.metagraph.hotkeys) != self.hotkeys_hash:
+            for uid, hotkey in enumerate(self.hotkeys):
+                if hotkey != self.metagraph.hotkeys[uid]:
+                    self.moving_averaged_scores[uid] = 0  # hotkey has been replaced
 
         # Check to see if the metagraph has changed size.
         # If so, we need to add new hotkeys and moving averages.
@@ -128,7 +136,18 @@ def resync_metagraph(self: "validators.neuron.neuron"):
         self.gating_model.resync(previous_metagraph, self.metagraph)
 
         # Update the hotkeys.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
+        set_hotkeys(self, self.metagraph.hotkeys)
+
+
+def hash_hotkeys(hotkeys: List[str]) -> bytes:
+    """Returns a short digest of the hotkeys, used to detect hotkey changes without comparing every entry."""
+    return hashlib.blake2b("\n".join(hotkeys).encode(), digest_size=8).digest()
+
+
+def set_hotkeys(self, hotkeys: List[str]):
+    """Snapshots the hotkeys as an immutable tuple along with their hash."""
+    self.hotkeys = tuple(hotkeys)
+    self.hotkeys_hash = hash_hotkeys(self.hotkeys)
 
 
 def resync_linear_layer(
@@ -190,13 +209,34 @@ def check_uid_availability(
     return True
 
 
+def get_available_uids(
+    metagraph: "bt.metagraph.Metagraph", vpermit_tao_limit: int
+) -> torch.BoolTensor:
+    """Vectorized version of check_uid_availability over every uid in the metagraph.
+    Args:
+        metagraph (:obj: bt.metagraph.Metagraph): Metagraph object
+        vpermit_tao_limit (int): Validator permit tao limit
+    Returns:
+        torch.BoolTensor: Mask of shape (metagraph.n) that is True for available uids
+    """
+    # Filter non serving axons.
+    serving = torch.tensor(
+        [axon.is_serving for axon in metagraph.axons], dtype=torch.bool
+    )
+    # Filter validator permit > 1024 stake.
+    validator_permit = torch.as_tensor(metagraph.validator_permit, dtype=torch.bool)
+    stake = torch.as_tensor(metagraph.S, dtype=torch.float32)
+    permit_ok = ~validator_permit | (stake <= vpermit_tao_limit)
+    return serving & permit_ok
+
+
 def save_state(self):
     r"""Save hotkeys, gating model, neuron model and moving average scores to filesystem."""
     bt.logging.info("save_state()")
     try:
         neuron_state_dict = {
             "neuron_weights": self.moving_averaged_scores.to("cpu").tolist(),
-            "neuron_hotkeys": self.hotkeys,
+            "neuron_hotkeys": list(self.hotkeys),
         }
         torch.save(neuron_state_dict, f"{self.config.neuron.full_path}/model.torch")
         bt.logging.success(
@@ -268,7 +308,7 @@ def load_state(self):
         # Check for nans in saved state dict
         elif not torch.isnan(neuron_weights).any():
             self.moving_averaged_scores = neuron_weights.to(self.device)
-        self.hotkeys = state_dict["neuron_hotkeys"]
+        set_hotkeys(self, state_dict["neuron_hotkeys"])
         bt.logging.success(
             prefix="Reloaded model",
             sufix=f"<blue>{ self.config.neuron.full_path }/model.torch</blue>",
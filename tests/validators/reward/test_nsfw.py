@@ -0,0 +1,46 @@
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import unittest
+from prompting.validators.reward.nsfw import NSFWRewardModel
+from prompting.validators.reward.reward import BaseRewardModel
+
+
+class EmptyBatchTokenizer:
+    def __call__(self, texts):
+        # Mirrors the fast tokenizer, which fails on an empty batch.
+        if not texts:
+            raise IndexError("list index out of range")
+        return {"input_ids": [[0] for _ in texts]}
+
+
+class NSFWRewardModelTestCase(unittest.TestCase):
+    def setUp(self):
+        # Skip loading the pretrained weights, the tests only exercise get_rewards.
+        self.model = NSFWRewardModel.__new__(NSFWRewardModel)
+        BaseRewardModel.__init__(self.model)
+        self.model.device = "cpu"
+        self.model.tokenizer = EmptyBatchTokenizer()
+        self.model.model = None
+
+    def test_get_rewards_without_completions(self):
+        self.assertEqual(self.model.get_rewards("prompt", [], "augment"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import torch
+import unittest
+from types import SimpleNamespace
+from prompting.validators.penalty.penalty import BasePenaltyModel
+
+
+def make_response(completion: str, status_code: int = 200) -> SimpleNamespace:
+    return SimpleNamespace(
+        completion=completion, dendrite=SimpleNamespace(status_code=status_code)
+    )
+
+
+class StubPenaltyModel(BasePenaltyModel):
+    @property
+    def name(self) -> str:
+        return "stub"
+
+    def __init__(self, max_penalty: float):
+        super().__init__(max_penalty=max_penalty)
+        self.penalized = []
+
+    def calculate_penalties(self, task, completions):
+        self.penalized.append(completions)
+        return torch.full((len(completions),), 0.5)
+
+
+class BasePenaltyModelApplyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.model = StubPenaltyModel(max_penalty=0.25)
+
+    def test_penalizes_only_successful_non_empty_completions(self):
+        responses = [
+            make_response("good"),
+            make_response("timed out", status_code=408),
+            make_response("   "),
+        ]
+
+        raw, adjusted, applied = self.model.apply_penalties(responses, task=None)
+
+        self.assertEqual(self.model.penalized, [["good"]])
+        self.assertEqual(raw.tolist(), [0.5, 0.0, 0.0])
+        self.assertEqual(adjusted.tolist(), [0.25, 0.0, 0.0])
+        self.assertEqual(applied.tolist(), [0.75, 1.0, 1.0])
+
+    def test_skips_calculation_without_successful_completions(self):
+        responses = [make_response("", status_code=408), make_response("  ")]
+
+        raw, _, applied = self.model.apply_penalties(responses, task=None)
+
+        self.assertEqual(self.model.penalized, [])
+        self.assertEqual(raw.tolist(), [0.0, 0.0])
+        self.assertEqual(applied.tolist(), [1.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import math
+import unittest
+from types import SimpleNamespace
+from prompting.validators.reward.reward import BaseRewardModel, BaseRewardEvent
+
+
+def make_response(completion: str, status_code: int = 200) -> SimpleNamespace:
+    return SimpleNamespace(
+        completion=completion, dendrite=SimpleNamespace(status_code=status_code)
+    )
+
+
+class StubRewardModel(BaseRewardModel):
+    @property
+    def name(self) -> str:
+        return "stub"
+
+    def __init__(self):
+        super().__init__()
+        self.scored = []
+
+    def get_rewards(self, prompt, completions, name):
+        self.scored.append(completions)
+        return [BaseRewardEvent(reward=float(len(c))) for c in completions]
+
+
+class BaseRewardModelApplyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.model = StubRewardModel()
+
+    def test_scores_only_successful_non_empty_completions(self):
+        responses = [
+            make_response("good"),
+            make_response("timed out", status_code=408),
+            make_response("   "),
+        ]
+
+        rewards, reward_events = self.model.apply("prompt", responses, "augment")
+
+        self.assertEqual(self.model.scored, [["good"]])
+        self.assertEqual(rewards[1].item(), 0.0)
+        self.assertEqual(rewards[2].item(), 0.0)
+        self.assertEqual(reward_events["stub"][0], 4.0)
+        self.assertTrue(math.isnan(reward_events["stub"][1]))
+        self.assertTrue(math.isnan(reward_events["stub"][2]))
+
+    def test_skipped_responses_are_left_out_of_normalization(self):
+        responses = [make_response("good"), make_response("", status_code=408)]
+
+        self.model.apply("prompt", responses, "augment")
+
+        self.assertEqual(self.model.count, 1)
+        self.assertEqual(float(self.model.mean), 4.0)
+
+    def test_all_responses_skipped(self):
+        responses = [make_response("", status_code=408), make_response("  ")]
+
+        rewards, _ = self.model.apply("prompt", responses, "augment")
+
+        self.assertEqual(self.model.scored, [[]])
+        self.assertEqual(rewards.tolist(), [0.0, 0.0])
+        self.assertEqual(self.model.count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
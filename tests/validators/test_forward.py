@@ -0,0 +1,76 @@
+# The MIT License (MIT)
+# Copyright © 2023 Yuma Rao
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+import torch
+import unittest
+from types import SimpleNamespace
+from prompting.validators.forward import (
+    restrict_format_followup_responses,
+    update_moving_averaged_scores,
+)
+
+
+class RestrictFormatFollowupResponsesTestCase(unittest.TestCase):
+    def restrict(self, completion: str, task_name: str = "followup") -> str:
+        response = SimpleNamespace(completion=completion)
+        restrict_format_followup_responses(None, [response], task_name)
+        return response.completion
+
+    def test_takes_first_question_without_preceding_sentences(self):
+        completion = "That is a good point. What do you mean? Tell me more?"
+        self.assertEqual(self.restrict(completion), " What do you mean?")
+
+    def test_takes_last_sentence_without_question(self):
+        completion = "First sentence. Second sentence. Last sentence."
+        self.assertEqual(self.restrict(completion), " Last sentence")
+
+    def test_keeps_at_most_40_words(self):
+        words = [f"w{i}" for i in range(50)]
+        completion = " ".join(words) + "?"
+        self.assertEqual(self.restrict(completion), " ".join(words[-40:]) + "?")
+
+    def test_ignores_non_followup_tasks(self):
+        completion = "First sentence. What do you mean?"
+        self.assertEqual(self.restrict(completion, task_name="answer"), completion)
+
+
+class UpdateMovingAveragedScoresTestCase(unittest.TestCase):
+    def test_updates_queried_uids_in_place(self):
+        scores = torch.tensor([1.0, 2.0, 3.0, 4.0])
+        uids = torch.tensor([3, 1])
+        rewards = torch.tensor([0.0, 1.0])
+
+        result = update_moving_averaged_scores(scores, uids, rewards, alpha=0.25)
+
+        self.assertIs(result, scores)
+        self.assertEqual(scores.tolist(), [1.0, 1.75, 3.0, 3.0])
+
+    def test_keeps_other_uids_unchanged(self):
+        scores = torch.arange(8, dtype=torch.float32)
+        expected = scores.clone()
+        uids = torch.tensor([2, 5])
+        rewards = torch.tensor([10.0, 20.0])
+
+        update_moving_averaged_scores(scores, uids, rewards, alpha=0.5)
+
+        expected[2] = 0.5 * 2.0 + 0.5 * 10.0
+        expected[5] = 0.5 * 5.0 + 0.5 * 20.0
+        self.assertTrue(torch.equal(scores, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,7 +20,12 @@ import bittensor as bt
 import copy
 import unittest
 from unittest.mock import MagicMock
-from prompting.validators.utils import resync_linear_layer, check_uid_availability
+from prompting.validators.utils import (
+    resync_linear_layer,
+    check_uid_availability,
+    get_available_uids,
+    hash_hotkeys,
+)
 
 
 class UtilsTestCase(unittest.TestCase):
@@ -151,6 +156,37 @@ class UtilsTestCase(unittest.TestCase):
         # has stake greater than vpermit_tao_limit
         self.assertFalse(result)
 
+    def test_get_available_uids_matches_check_uid_availability(self):
+        # Arrange: Mix of non serving axons, validators above and below vpermit_tao_limit
+        v_permit_tao_limit = 1
+        for uid, axon in enumerate(self.metagraph.axons):
+            axon.is_serving = uid % 3 != 0
+        for uid in range(0, 1024, 5):
+            self.metagraph.validator_permit[uid] = True
+            self.metagraph.S[uid] = uid % 2 + 1
+
+        # Act: Compute the availability mask over every uid
+        result = get_available_uids(
+            self.metagraph, vpermit_tao_limit=v_permit_tao_limit
+        )
+
+        # Assert: Ensure that the mask matches the per uid availability check
+        expected = [
+            check_uid_availability(self.metagraph, uid, v_permit_tao_limit)
+            for uid in range(0, 1024)
+        ]
+        self.assertEqual(result.tolist(), expected)
+
+    def test_hash_hotkeys_detects_replaced_hotkey(self):
+        # Arrange: Snapshot the hotkeys and replace one of them
+        hotkeys = tuple(self.metagraph.hotkeys)
+        modified_hotkeys = list(hotkeys)
+        modified_hotkeys[10] = "test"
+
+        # Assert: Ensure that the hash is stable for equal hotkeys and changes when a hotkey is replaced
+        self.assertEqual(hash_hotkeys(hotkeys), hash_hotkeys(list(hotkeys)))
+        self.assertNotEqual(hash_hotkeys(hotkeys), hash_hotkeys(modified_hotkeys))
+
 
 if __name__ == "__main__":
     unittest.main()